@@ -41,6 +41,7 @@ EQNAME_PATTERN = re.compile(
 )
 WRONG_ESCAPE_PATTERN = re.compile(r'%(?![a-fA-F\d]{2})')
 XML_NEWLINES_PATTERN = re.compile('\r\n|\r|\n')
+JSON_UNICODE_ESCAPE_PATTERN = re.compile(r'\\u([0-9A-Fa-f]{4})')
 
 
 def upper_camel_case(s: str) -> str:
@@ -52,7 +53,7 @@ def collapse_white_spaces(s: str) -> str:
 
 
 def is_ncname(s: str) -> bool:
-    return re.match(r'^[^\d\W][\w.\-\u00B7\u0300-\u036F\u203F\u2040]*$', s) is not None
+    return NCNAME_PATTERN.match(s) is not None
 
 
 def is_idrefs(value: Optional[str]) -> bool:
@@ -252,7 +253,7 @@ def unescape_json_string(s: str) -> str:
         replace(r'\/', '/').\
         replace('\\\\', '\\')
 
-    return re.sub(r'\\u([0-9A-Fa-f]{4})', unicode_escape_callback, s)
+    return JSON_UNICODE_ESCAPE_PATTERN.sub(unicode_escape_callback, s)
 
 
 def iter_sequence(obj: Any) -> Iterator[Any]:
@@ -69,10 +69,10 @@ XSD_NUMERIC = '{%s}numeric' % XSD_NAMESPACE
 
 
 def get_namespace(name: str) -> str:
-    try:
-        return NAMESPACE_URI_PATTERN.match(name).group(1)  # type: ignore[union-attr]
-    except AttributeError:
+    if name[:1] != '{':
         return ''
+    namespace, sep, _ = name[1:].partition('}')
+    return namespace if sep else ''
 
 
 def split_expanded_name(name: str) -> Tuple[str, str]:
@@ -101,12 +101,17 @@ def get_prefixed_name(
     except (ValueError, TypeError):
         raise ValueError("{!r} is not a QName".format(qname))
 
-    for prefix, uri in sorted(namespaces.items(), reverse=True,
-                              key=lambda x: x if x[0] is not None else ('', x[1])):
+    # Single pass on namespace map: if more prefixes are mapped to the URI
+    # the greatest one is chosen, so the result doesn't depend on map order.
+    matching_prefix: Optional[str] = None
+    for prefix, uri in namespaces.items():
         if uri == ns_uri:
-            return '%s:%s' % (prefix, local_name) if prefix else local_name
-    else:
+            if matching_prefix is None or (prefix or '') > matching_prefix:
+                matching_prefix = prefix or ''
+
+    if matching_prefix is None:
         return qname
+    return f'{matching_prefix}:{local_name}' if matching_prefix else local_name
 
 
 def get_expanded_name(
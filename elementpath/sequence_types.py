@@ -8,6 +8,7 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import re
+from functools import lru_cache
 from itertools import zip_longest
 from typing import TYPE_CHECKING, cast, Any, Optional
 
@@ -47,12 +48,14 @@ COMMON_SEQUENCE_TYPES = {
 SEQUENCE_TYPE_PATTERN = re.compile(r'\s?([()?*+,])\s?')
 
 
+@lru_cache(maxsize=1024)
 def normalize_sequence_type(sequence_type: str) -> str:
     sequence_type = WHITESPACES_PATTERN.sub(' ', sequence_type).strip()
     sequence_type = SEQUENCE_TYPE_PATTERN.sub(r'\1', sequence_type)
     return sequence_type.replace(',', ', ').replace(')as', ') as')
 
 
+@lru_cache(maxsize=1024)
 def is_sequence_type_restriction(st1: str, st2: str) -> bool:
     """Returns `True` if st2 is a restriction of st1."""
     st1, st2 = normalize_sequence_type(st1), normalize_sequence_type(st2)
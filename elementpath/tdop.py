@@ -533,7 +533,7 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
                 if self.name_pattern.match(symbol) is None:
                     self.next_token = self.symbol_table['(unknown)'](self, symbol)
                     raise self.next_token.wrong_syntax()
-                self.next_token = self.symbol_table['(name)'](self, symbol)
+                self.next_token = self.symbol_table['(name)'](self, sys.intern(symbol))
         elif literal is not None:
             if literal[0] in '\'"':
                 value = self.unescape(literal)
@@ -557,7 +557,8 @@ class Parser(Generic[TK_co], metaclass=ParserMeta):
             else:
                 self.next_token = self.symbol_table['(integer)'](self, int(literal))
         elif name is not None:
-            self.next_token = self.symbol_table['(name)'](self, name)
+            # Intern names, so matching node names is mostly an identity check
+            self.next_token = self.symbol_table['(name)'](self, sys.intern(name))
         elif unknown is not None:
             self.next_token = self.symbol_table['(unknown)'](self, unknown)
         else:
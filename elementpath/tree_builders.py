@@ -156,6 +156,7 @@ def build_node_tree(root: ElementTreeRootType,
                 position += 1
             else:
                 child = ProcessingInstructionNode(elem, parent, position)
+                position += 1
 
             parent.children.append(child)
             if elem.tail is not None:
@@ -215,7 +216,7 @@ def build_lxml_node_tree(root: LxmlRootType,
         nonlocal child
 
         # Add root siblings (comments and processing instructions)
-        for e in reversed([x for x in elem.itersiblings(preceding=True)]):
+        for e in reversed(list(elem.itersiblings(preceding=True))):
             if e.tag.__name__ == 'Comment':  # type: ignore[attr-defined]
                 parent.children.append(CommentNode(e, parent, position))
             else:
@@ -302,6 +303,7 @@ def build_lxml_node_tree(root: LxmlRootType,
                 position += 1
             else:
                 child = ProcessingInstructionNode(elem, parent, position)
+                position += 1
 
             parent.children.append(child)
             if elem.tail is not None:
@@ -120,7 +120,7 @@ def evaluate_position_function(self, context=None):
 
 @method(function('count', nargs=1, sequence_types=('item()*', 'xs:integer')))
 def evaluate_count_function(self, context=None):
-    return len([x for x in self[0].select(self.context or context)])
+    return len(list(self[0].select(self.context or context)))
 
 
 @method(function('id', nargs=1, sequence_types=('xs:string*', 'element()*')))
@@ -162,14 +162,15 @@ def evaluate_name_related_functions(self, context=None):
 
     symbol = self.symbol
     if symbol == 'name':
-        nsmap = getattr(arg, 'nsmap', self.parser.namespaces)
-        return get_prefixed_name(name, nsmap)
+        if isinstance(arg, ElementNode):
+            return arg.prefixed_name
+        return get_prefixed_name(name, self.parser.namespaces)
     elif symbol == 'local-name':
-        return name if not name or name[0] != '{' else name.split('}')[1]
+        return arg.local_name
     elif self.parser.version == '1.0':
-        return '' if not name or name[0] != '{' else name.split('}')[0][1:]
+        return arg.namespace_uri
     else:
-        return AnyURI('') if not name or name[0] != '{' else AnyURI(name.split('}')[0][1:])
+        return AnyURI(arg.namespace_uri)
 
 
 ###
@@ -337,12 +338,12 @@ def evaluate_substring_before_or_after_functions(self, context=None):
 @method(function('boolean', nargs=1,
                  sequence_types=('item()*', 'xs:boolean')))
 def evaluate_boolean_function(self, context=None):
-    return self.boolean_value([x for x in self[0].select(self.context or context)])
+    return self.boolean_value(list(self[0].select(self.context or context)))
 
 
 @method(function('not', nargs=1, sequence_types=('item()*', 'xs:boolean')))
 def evaluate_not_function(self, context=None):
-    return not self.boolean_value([x for x in self[0].select(self.context or context)])
+    return not self.boolean_value(list(self[0].select(self.context or context)))
 
 
 @method(function('true', nargs=0, sequence_types=('xs:boolean',)))
@@ -431,7 +431,7 @@ def evaluate_boolean_type_and_function(self, context=None):
         context = self.context
 
     if self.label == 'function':
-        return self.boolean_value([x for x in self[0].select(context)])
+        return self.boolean_value(list(self[0].select(context)))
 
     # xs:boolean constructor
     arg = self.data_value(self.get_argument(context))
@@ -27,8 +27,7 @@ from ..helpers import QNAME_PATTERN, is_idrefs, is_xml_codepoint, round_number
 from ..datatypes import DateTime10, DateTime, Date10, Date, Float10, \
     DoubleProxy, Time, Duration, DayTimeDuration, YearMonthDuration, \
     UntypedAtomic, AnyURI, QName, NCName, Id, ArithmeticProxy, NumericProxy
-from ..namespaces import XML_NAMESPACE, get_namespace, split_expanded_name, \
-    XML_ID, XML_LANG
+from ..namespaces import XML_NAMESPACE, XML_ID, XML_LANG, get_namespace
 from ..compare import deep_equal
 from ..sequence_types import match_sequence_type
 from ..xpath_context import XPathSchemaContext
@@ -255,8 +254,8 @@ def evaluate_node_name_function(self, context=None):
     if name is None:
         return []
     elif name.startswith('{'):
-        # name is a QName in extended format
-        namespace, local_name = split_expanded_name(name)
+        # name is a QName in extended format, use its precomputed parts
+        namespace, local_name = arg.namespace_uri, arg.local_name
         for pfx, uri in self.parser.namespaces.items():
             if uri == namespace:
                 return QName(uri, '{}:{}'.format(pfx, local_name))
@@ -617,7 +616,7 @@ def select_remove_function(self, context=None):
 
 @method(function('reverse', nargs=1, sequence_types=('item()*', 'item()*')))
 def select_reverse_function(self, context=None):
-    yield from reversed([x for x in self[0].select(self.context or context)])
+    yield from reversed(list(self[0].select(self.context or context)))
 
 
 @method(function('subsequence', nargs=(2, 3),
@@ -649,7 +648,7 @@ def select_unordered_function(self, context=None):
     if self.context is not None:
         context = self.context
 
-    yield from sorted([x for x in self[0].select(context)], key=lambda x: self.string_value(x))
+    yield from sorted(self[0].select(context), key=lambda x: self.string_value(x))
 
 
 ###
@@ -1511,7 +1510,7 @@ def select_idref_function(self, context=None):
     if self.context is not None:
         context = self.context
 
-    ids = [x for x in self[0].select(context=copy(context))]
+    ids = list(self[0].select(context=copy(context)))
     node = self.get_argument(context, index=1, default_to_context=True)
 
     if isinstance(context, XPathSchemaContext):
@@ -149,7 +149,7 @@ def evaluate_if_expression(self, context=None):
 
 @method('if')
 def select_if_expression(self, context=None):
-    if self.boolean_value([x for x in self[0].select(copy(context))]):
+    if self.boolean_value(list(self[0].select(copy(context)))):
         if isinstance(context, XPathSchemaContext):
             self[2].evaluate(copy(context))
         yield from self[1].select(context)
@@ -201,7 +201,7 @@ def evaluate_quantified_expressions(self, context=None):
 
     for results in copy(context).iter_product(selectors, varnames):
         context.variables.update(x for x in zip(varnames, results))
-        if self.boolean_value([x for x in self[-1].select(copy(context))]):
+        if self.boolean_value(list(self[-1].select(copy(context)))):
             if some:
                 return True
         elif not some:
@@ -389,7 +389,7 @@ def evaluate_cast_expressions(self, context=None):
         msg = "atomic type %r not found in the in-scope schema types"
         raise self.error('XPST0051', msg % atomic_type)
 
-    result = [res for res in self[0].select(context)]
+    result = list(self[0].select(context))
     if len(result) > 1:
         if self.symbol != 'cast':
             return False
@@ -592,13 +592,13 @@ def led_node_comparison(self, left):
 def evaluate_node_comparison(self, context=None):
     symbol = self.symbol
 
-    left = [x for x in self[0].select(context)]
+    left = list(self[0].select(context))
     if not left:
         return []
     elif len(left) > 1 or not isinstance(left[0], XPathNode):
         raise self[0].error('XPTY0004', "left operand of %r must be a single node" % symbol)
 
-    right = [x for x in self[1].select(context)]
+    right = list(self[1].select(context))
     if not right:
         return []
     elif len(right) > 1 or not isinstance(right[0], XPathNode):
@@ -637,7 +637,7 @@ def led_range_expression(self, left):
 def evaluate_range_expression(self, context=None):
     start, stop = self.get_operands(context, cls=Integer)
     try:
-        return [x for x in range(start, stop + 1)]
+        return list(range(start, stop + 1))
     except TypeError:
         return []
 
@@ -20,8 +20,6 @@ from copy import copy
 from itertools import zip_longest
 from typing import cast, Any, Dict, List, Optional, Tuple
 from urllib.parse import urlsplit
-from urllib.request import urlopen
-from urllib.error import URLError
 
 try:
     import zoneinfo
@@ -32,12 +30,11 @@ from ..exceptions import ElementPathError
 from ..tdop import MultiLabel
 from ..helpers import OCCURRENCE_INDICATORS, EQNAME_PATTERN, \
     XML_NEWLINES_PATTERN, is_xml_codepoint, node_position
-from ..namespaces import get_expanded_name, split_expanded_name, \
-    XPATH_FUNCTIONS_NAMESPACE, XSD_NAMESPACE
+from ..namespaces import get_expanded_name, XPATH_FUNCTIONS_NAMESPACE, XSD_NAMESPACE
 from ..datatypes import xsd10_atomic_types, NumericProxy, QName, Date10, \
     DateTime10, Time, AnyURI, UntypedAtomic
 from ..sequence_types import is_sequence_type, match_sequence_type
-from ..etree import defuse_xml, etree_iter_paths
+from ..etree import defuse_xml
 from ..xpath_nodes import XPathNode, ElementNode, TextNode, AttributeNode, \
     NamespaceNode, DocumentNode, ProcessingInstructionNode, CommentNode
 from ..tree_builders import get_node_tree
@@ -1067,18 +1064,15 @@ def evaluate_path_function(self, context=None):
     if isinstance(item, DocumentNode):
         return '/'
     elif isinstance(item, (ElementNode, CommentNode, ProcessingInstructionNode)):
-        elem = item.elem
+        node = item
     elif isinstance(item, TextNode):
-        elem = item.parent.elem
+        node = item.parent
         suffix = '/text()[1]'
     elif isinstance(item, AttributeNode):
-        elem = item.parent.elem
-        if item.name.startswith('{'):
-            suffix = f'/@Q{item.name}'
-        else:
-            suffix = f'/@{item.name}'
+        node = item.parent
+        suffix = f'/@{item.uri_qualified_name}'
     elif isinstance(item, NamespaceNode):
-        elem = item.parent.elem
+        node = item.parent
         if item.prefix:
             suffix = f'/namespace::{item.prefix}'
         else:
@@ -1087,11 +1081,9 @@ def evaluate_path_function(self, context=None):
         return []
 
     if isinstance(context.root, DocumentNode):
-        root = context.root.getroot().elem
-        if root.tag.startswith('{'):
-            path = f'/Q{root.tag}[1]'
-        else:
-            path = f'/Q{{}}{root.tag}[1]'
+        root_node = context.root.getroot()
+        root = root_node.elem
+        path = f'/{root_node.uri_qualified_name}[1]'
     else:
         # If root is an element use the function that returns the root of the tree
         root = context.root.elem
@@ -1100,16 +1092,31 @@ def evaluate_path_function(self, context=None):
     if isinstance(item, ProcessingInstructionNode):
         if item.parent is None or isinstance(item.parent, DocumentNode):
             return f'/processing-instruction({item.name})[{context.position}]'
+        node = item.parent
+        suffix = f'/processing-instruction({item.name})[{node.get_child_position(item)}]'
     elif isinstance(item, CommentNode):
         if item.parent is None or isinstance(item.parent, DocumentNode):
             return f'/comment()[{context.position}]'
+        node = item.parent
+        suffix = f'/comment()[{node.get_child_position(item)}]'
 
-    for e, path in etree_iter_paths(root, path):
-        if e is elem:
-            return path + suffix
-    else:
+    # The other steps are all elements: walk up to the root using
+    # the positions cached by parents.
+    steps = []
+    while node is not None and node.elem is not root:
+        parent = node.parent
+        if not isinstance(parent, ElementNode):
+            return []  # the node is not in the tree of the context root
+
+        steps.append(f'{node.uri_qualified_name}[{parent.get_child_position(node)}]')
+        node = parent
+
+    if node is None:
         return []
 
+    steps.append(path)
+    return '/'.join(reversed(steps)) + suffix
+
 
 @method(function('has-children', nargs=(0, 1), sequence_types=('node()?', 'xs:boolean')))
 def evaluate_has_children_function(self, context=None):
@@ -1139,7 +1146,7 @@ def select_innermost_function(self, context=None):
         raise self.missing_context()
 
     context = copy(context)
-    nodes = [e for e in self[0].select(context)]
+    nodes = list(self[0].select(context))
     if any(not isinstance(x, XPathNode) for x in nodes):
         raise self.error('XPTY0004', 'argument must contain only nodes')
 
@@ -1154,7 +1161,7 @@ def select_outermost_function(self, context=None):
         raise self.missing_context()
 
     context = copy(context)
-    nodes = [e for e in self[0].select(context)]
+    nodes = list(self[0].select(context))
     if any(not isinstance(x, XPathNode) for x in nodes):
         raise self.error('XPTY0004', 'argument must contain only nodes')
 
@@ -1271,6 +1278,9 @@ def evaluate_unparsed_text_functions(self, context=None):
     if context is not None and uri in context.text_resources:
         text = context.text_resources[uri]
     else:
+        from urllib.request import urlopen  # slow import, do it only when needed
+        from urllib.error import URLError
+
         try:
             with urlopen(uri) as rp:
                 stream_reader = codecs.getreader(encoding)(rp)
@@ -1332,6 +1342,9 @@ def evaluate_unparsed_text_available_function(self, context=None):
     except LookupError:
         return False
 
+    from urllib.request import urlopen  # slow import, do it only when needed
+    from urllib.error import URLError
+
     try:
         with urlopen(uri) as rp:
             stream_reader = codecs.getreader(encoding)(rp)
@@ -1630,7 +1643,7 @@ def select_fold_right_function(self, context=None):
     zero = self.get_argument(context, index=1)
 
     result = zero
-    sequence = [x for x in self[0].select(copy(context))]
+    sequence = list(self[0].select(copy(context)))
 
     for item in reversed(sequence):
         result = func(item, result, context=context)
@@ -1745,8 +1758,8 @@ def evaluate_node_name_function(self, context=None):
     if name is None:
         return []
     elif name.startswith('{'):
-        # name is a QName in extended format
-        namespace, local_name = split_expanded_name(name)
+        # name is a QName in extended format, use its precomputed parts
+        namespace, local_name = arg.namespace_uri, arg.local_name
         for pfx, uri in self.parser.namespaces.items():
             if uri == namespace:
                 if not pfx:
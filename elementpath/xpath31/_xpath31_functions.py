@@ -20,7 +20,6 @@ import re
 from datetime import datetime, timedelta
 from decimal import Decimal
 from itertools import product
-from urllib.request import urlopen
 from urllib.parse import urlsplit
 
 from ..datatypes import AnyAtomicType, AbstractBinary, AbstractDateTime, \
@@ -104,7 +103,7 @@ def evaluate_map_keys_function(self, context=None):
         context = self.context
 
     map_ = self.get_argument(context, required=True, cls=XPathMap)
-    return [x for x in map_.keys(context)]
+    return list(map_.keys(context))
 
 
 @method(function('contains', prefix='map', nargs=2,
@@ -657,6 +656,8 @@ def evaluate_parse_json_functions(self, context=None):
 
         try:
             if urlsplit(href).scheme:
+                from urllib.request import urlopen  # slow import, do it only when needed
+
                 with urlopen(href) as fp:
                     json_text = fp.read().decode('utf-8')
             else:
@@ -835,7 +836,7 @@ def evaluate_random_number_generator_function(self, context=None):
                 return []
 
             try:
-                seq = [x for x in args[0]]
+                seq = list(args[0])
             except TypeError:
                 return [args[0]]
             else:
@@ -83,8 +83,9 @@ def select_map_or_array_kind_test(self, context=None):
     if context is None:
         raise self.missing_context()
 
+    sequence_type = self.source
     for item in context.iter_children_or_self():
-        if match_sequence_type(item, self.source, self.parser):
+        if match_sequence_type(item, sequence_type, self.parser):
             yield item
 
 
@@ -161,7 +162,7 @@ class LookupOperatorToken(XPathToken):
     def evaluate(self, context=None):
         if not self:
             return self.value  # a placeholder token
-        return [x for x in self.select(context)]
+        return list(self.select(context))
 
     def select(self, context=None):
         if not self:
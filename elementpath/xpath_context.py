@@ -198,7 +198,7 @@ class XPathContext:
         obj: XPathContext = object.__new__(self.__class__)
         obj.__dict__.update(self.__dict__)
         obj.axis = None
-        obj.variables = {k: v for k, v in self.variables.items()}
+        obj.variables = self.variables.copy()
         return obj
 
     @property
@@ -311,7 +311,7 @@ class XPathContext:
     def inner_focus_select(self, token: Union['XPathToken', 'XPathAxis']) -> Iterator[Any]:
         """Apply the token's selector with an inner focus."""
         status = self.item, self.size, self.position, self.axis
-        results = [x for x in token.select(copy(self))]
+        results = list(token.select(copy(self)))
         self.axis = None
 
         if token.label == 'axis' and cast('XPathAxis', token).reverse_axis:
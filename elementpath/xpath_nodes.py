@@ -7,6 +7,7 @@
 #
 # @author Davide Brunato <brunato@sissa.it>
 #
+import sys
 from importlib import import_module
 from urllib.parse import urljoin
 from types import ModuleType
@@ -15,7 +16,7 @@ from typing import cast, Any, Dict, Iterator, List, MutableMapping, Optional, Tu
 from .datatypes import UntypedAtomic, get_atomic_value, AtomicValueType
 from .namespaces import XML_NAMESPACE, XML_BASE, XSI_NIL, \
     XSD_ANY_TYPE, XSD_ANY_SIMPLE_TYPE, XSD_ANY_ATOMIC_TYPE, \
-    XML_ID, XSD_IDREF, XSD_IDREFS
+    XML_ID, XSD_IDREF, XSD_IDREFS, get_prefixed_name
 from .protocols import ElementProtocol, DocumentProtocol, XsdElementProtocol, \
     XsdAttributeProtocol, XsdTypeProtocol, XsdSchemaProtocol
 from .helpers import match_wildcard, is_absolute_uri
@@ -27,12 +28,46 @@ __all__ = ['is_xpath_node', 'SchemaElemType', 'ChildNodeType', 'ElementMapType',
            'LazyElementNode', 'SchemaElementNode', 'DocumentNode']
 
 _XSD_SPECIAL_TYPES = {XSD_ANY_TYPE, XSD_ANY_SIMPLE_TYPE, XSD_ANY_ATOMIC_TYPE}
+_XML_NAMESPACE_ITEM = ('xml', XML_NAMESPACE)  # always the first namespace node
+_XSI_NIL_TRUE = frozenset(('true', '1'))
 
 SchemaElemType = Union[XsdSchemaProtocol, XsdElementProtocol]
 ChildNodeType = Union['TextNode', 'ElementNode', 'CommentNode', 'ProcessingInstructionNode']
 ElementMapType = Dict[Union[ElementProtocol, SchemaElemType], 'ElementNode']
 
 
+def _intern(s: str) -> str:
+    """Interns a string, converting instances of str subclasses that can't be interned."""
+    return sys.intern(s if s.__class__ is str else str(s))
+
+
+def _split_name(name: Optional[str]) -> Tuple[str, str]:
+    """
+    Splits a node name into its namespace URI and local part. Both parts are
+    interned, because they are a few distinct strings repeated for many nodes.
+    """
+    if not isinstance(name, str) or not name:
+        return '', ''
+    elif name[0] != '{':
+        return '', _intern(name)
+    namespace, _, local_name = name[1:].partition('}')
+    return sys.intern(namespace), sys.intern(local_name)
+
+
+def _match_wildcard(name: str, namespace: str, local_name: str, wildcard: str) -> bool:
+    """
+    Matches a name wildcard using the precomputed parts of a node name when
+    possible, otherwise falls back to the full name matching.
+    """
+    if wildcard == '*' or wildcard == '*:*':
+        return True
+    elif wildcard.startswith('*:'):
+        return local_name == wildcard[2:]
+    elif namespace and wildcard.startswith('{') and wildcard.endswith('}*'):
+        return namespace == wildcard[1:-2]
+    return match_wildcard(name, wildcard)
+
+
 ###
 # XQuery and XPath Data Model: https://www.w3.org/TR/xpath-datamodel/
 #
@@ -84,6 +119,16 @@ class XPathNode:
     def name(self) -> Optional[str]:
         return None
 
+    @property
+    def local_name(self) -> str:
+        """The local part of the node name, an empty string for unnamed nodes."""
+        return _split_name(self.name)[1]
+
+    @property
+    def namespace_uri(self) -> str:
+        """The namespace URI of the node name, an empty string if it has no namespace."""
+        return _split_name(self.name)[0]
+
     @property
     def type_name(self) -> Optional[str]:
         return None
@@ -138,35 +183,69 @@ class AttributeNode(XPathNode):
     parent: Optional['ElementNode']
 
     kind = 'attribute'
+    _typed_value: Optional[Tuple[XsdTypeProtocol, str, AtomicValueType]]
+    _id_flags: Optional[Tuple[XsdTypeProtocol, bool, bool]]
 
-    __slots__ = '_name', 'value', 'xsd_type'
+    __slots__ = '_name', '_namespace', '_local_name', 'value', 'xsd_type', \
+                '_typed_value', '_id_flags'
 
     def __init__(self,
                  name: Optional[str], value: Union[str, XsdAttributeProtocol],
                  parent: Optional['ElementNode'] = None,
                  position: int = 1,
                  xsd_type: Optional[XsdTypeProtocol] = None) -> None:
-        self._name = name
+        self._name = _intern(name) if name else name
+        self._namespace, self._local_name = _split_name(name)
         self.value: Union[str, XsdAttributeProtocol] = value
         self.parent = parent
         self.position = position
         self.xsd_type = xsd_type
+        self._typed_value = None
+        self._id_flags = None
+
+    def _get_id_flags(self) -> Tuple[bool, bool]:
+        """
+        Returns the ID and IDREFS flags derived from the XSD type. They are
+        computed once and cached together with the type, that could be changed.
+        """
+        if self.xsd_type is None:
+            return False, False
+        elif self._id_flags is None or self._id_flags[0] is not self.xsd_type:
+            root_type = self.xsd_type.root_type
+            self._id_flags = (
+                self.xsd_type,
+                self.xsd_type.is_key(),
+                root_type.name == XSD_IDREF or root_type.name == XSD_IDREFS
+            )
+        return self._id_flags[1], self._id_flags[2]
 
     @property
     def is_id(self) -> bool:
-        return self._name == XML_ID or self.xsd_type is not None and self.xsd_type.is_key()
+        return self._name == XML_ID or self._get_id_flags()[0]
 
     @property
     def is_idrefs(self) -> bool:
-        if self.xsd_type is None:
-            return False
-        root_type = self.xsd_type.root_type
-        return root_type.name == XSD_IDREF or root_type.name == XSD_IDREFS
+        return self._get_id_flags()[1]
 
     @property
     def name(self) -> Optional[str]:
         return self._name
 
+    @property
+    def local_name(self) -> str:
+        return self._local_name
+
+    @property
+    def namespace_uri(self) -> str:
+        return self._namespace
+
+    @property
+    def uri_qualified_name(self) -> Optional[str]:
+        """The name in the EQName format if it has a namespace, the local name otherwise."""
+        if self._namespace:
+            return f'Q{{{self._namespace}}}{self._local_name}'
+        return self._name
+
     @property
     def type_name(self) -> Optional[str]:
         if self.xsd_type is None:
@@ -185,7 +264,12 @@ class AttributeNode(XPathNode):
             return get_atomic_value(self.value.type)
         elif self.xsd_type is None or self.xsd_type.name in _XSD_SPECIAL_TYPES:
             return UntypedAtomic(self.value)
-        return cast(AtomicValueType, self.xsd_type.decode(self.value))
+        elif self._typed_value is None or self._typed_value[0] is not self.xsd_type \
+                or self._typed_value[1] != self.value:
+            # Cache the decoded value together with the type and the value it derives from
+            value = cast(AtomicValueType, self.xsd_type.decode(self.value))
+            self._typed_value = self.xsd_type, self.value, value
+        return self._typed_value[2]
 
     def as_item(self) -> Tuple[Optional[str], Union[str, XsdAttributeProtocol]]:
         return self._name, self.value
@@ -206,7 +290,7 @@ class AttributeNode(XPathNode):
         if self._name is None:
             return False
         elif '*' in name:
-            return match_wildcard(self._name, name)
+            return _match_wildcard(self._name, self._namespace, self._local_name, name)
         else:
             return self._name == name
 
@@ -239,8 +323,8 @@ class NamespaceNode(XPathNode):
                  prefix: Optional[str], uri: str,
                  parent: Optional['ElementNode'] = None,
                  position: int = 1) -> None:
-        self.prefix = prefix
-        self.uri = uri
+        self.prefix = _intern(prefix) if prefix else prefix
+        self.uri = _intern(uri)
         self.parent = parent
         self.position = position
 
@@ -437,11 +521,18 @@ class ElementNode(XPathNode):
     elements: Optional[ElementMapType]
     _namespace_nodes: Optional[List['NamespaceNode']]
     _attributes: Optional[List['AttributeNode']]
-
-    uri: Optional[str] = None
-
-    __slots__ = 'nsmap', 'elem', 'xsd_type', 'elements', \
-                '_namespace_nodes', '_attributes', 'children', '__dict__'
+    _prefixed_name: Optional[Tuple[Any, MutableMapping[Optional[str], str], str]]
+    _uri_qualified_name: Optional[str]
+    _tag: str
+    _namespace: str
+    _local_name: str
+    _child_positions: Optional[Dict[int, int]]
+    _typed_value: Optional[Tuple[XsdTypeProtocol, Optional[str], Optional[AtomicValueType]]]
+    uri: Optional[str]
+
+    __slots__ = 'nsmap', 'elem', 'xsd_type', 'elements', 'uri', '_namespace_nodes', \
+                '_attributes', '_prefixed_name', '_uri_qualified_name', '_tag', \
+                '_namespace', '_local_name', '_child_positions', '_typed_value', 'children'
 
     def __init__(self,
                  elem: Union[ElementProtocol, SchemaElemType],
@@ -455,8 +546,15 @@ class ElementNode(XPathNode):
         self.position = position
         self.xsd_type = xsd_type
         self.elements = None
+        self.uri = None
         self._namespace_nodes = None
         self._attributes = None
+        self._prefixed_name = None
+        self._uri_qualified_name = None
+        self._tag = elem.tag
+        self._namespace, self._local_name = _split_name(self._tag)
+        self._child_positions = None
+        self._typed_value = None
         self.children = []
 
         if nsmap is not None:
@@ -477,7 +575,7 @@ class ElementNode(XPathNode):
         return len(self.children)
 
     def __iter__(self) -> Iterator[ChildNodeType]:
-        yield from self.children
+        return iter(self.children)
 
     @property
     def value(self) -> Union[ElementProtocol, SchemaElemType]:
@@ -495,6 +593,50 @@ class ElementNode(XPathNode):
     def name(self) -> str:
         return self.elem.tag
 
+    @property
+    def local_name(self) -> str:
+        self._update_name_parts()
+        return self._local_name
+
+    @property
+    def namespace_uri(self) -> str:
+        self._update_name_parts()
+        return self._namespace
+
+    def _update_name_parts(self) -> str:
+        """
+        Returns the tag of the wrapped element. The precomputed name parts are
+        derived from the tag, so they are split again if the element is renamed.
+        """
+        tag = self.elem.tag
+        if tag != self._tag:
+            self._tag = tag
+            self._namespace, self._local_name = _split_name(tag)
+            self._uri_qualified_name = None
+        return tag
+
+    @property
+    def prefixed_name(self) -> str:
+        """
+        The name of the element in prefixed format, resolved with the in-scope
+        namespaces. Cached because it requires a scan of the namespace map, the
+        value is recomputed if the element is renamed or the nsmap is replaced.
+        """
+        tag, nsmap = self.elem.tag, self.nsmap
+        if self._prefixed_name is None or self._prefixed_name[0] != tag \
+                or self._prefixed_name[1] is not nsmap:
+            prefixed_name = get_prefixed_name(tag, cast(Dict[Optional[str], str], nsmap))
+            self._prefixed_name = tag, nsmap, prefixed_name
+        return self._prefixed_name[2]
+
+    @property
+    def uri_qualified_name(self) -> str:
+        """The name of the element in the EQName format 'Q{uri}local-name'."""
+        self._update_name_parts()
+        if self._uri_qualified_name is None:
+            self._uri_qualified_name = f'Q{{{self._namespace}}}{self._local_name}'
+        return self._uri_qualified_name
+
     @property
     def type_name(self) -> Optional[str]:
         if self.xsd_type is None:
@@ -520,13 +662,15 @@ class ElementNode(XPathNode):
 
     @property
     def nilled(self) -> bool:
-        return self.elem.get(XSI_NIL) in ('true', '1')
+        return self.elem.get(XSI_NIL) in _XSI_NIL_TRUE
 
     @property
     def string_value(self) -> str:
         if self.xsd_type is not None and self.xsd_type.is_element_only():
             # Element-only text content is normalized
             return ''.join(etree_iter_strings(self.elem, normalize=True))
+        elif not len(self.elem):
+            return self.elem.text or ''  # a leaf element, no descendants to walk
         return ''.join(etree_iter_strings(self.elem))
 
     @property
@@ -534,40 +678,46 @@ class ElementNode(XPathNode):
         if self.xsd_type is None or \
                 self.xsd_type.name in _XSD_SPECIAL_TYPES or \
                 self.xsd_type.has_mixed_content():
+            if not len(self.elem):
+                return UntypedAtomic(self.elem.text or '')
             return UntypedAtomic(''.join(etree_iter_strings(self.elem)))
         elif self.xsd_type.is_element_only() or self.xsd_type.is_empty():
             return None
         elif self.elem.get(XSI_NIL) and getattr(self.xsd_type.parent, 'nillable', None):
             return None
 
-        if self.elem.text is not None:
-            value = self.xsd_type.decode(self.elem.text)
-        elif self.elem.get(XSI_NIL) in ('1', 'true'):
+        text = self.elem.text
+        if text is None and self.elem.get(XSI_NIL) in _XSI_NIL_TRUE:
             return ''
-        else:
-            value = self.xsd_type.decode('')
+        elif self._typed_value is None or self._typed_value[0] is not self.xsd_type \
+                or self._typed_value[1] != text:
+            # Cache the decoded value together with the type and the text it derives from
+            value = self.xsd_type.decode(text if text is not None else '')
+            self._typed_value = self.xsd_type, text, cast(Optional[AtomicValueType], value)
 
-        return cast(Optional[AtomicValueType], value)
+        return self._typed_value[2]
 
     @property
     def namespace_nodes(self) -> List['NamespaceNode']:
         if self._namespace_nodes is None:
             # Lazy generation of namespace nodes of the element
-            position = self.position + 1
-            self._namespace_nodes = [NamespaceNode('xml', XML_NAMESPACE, self, position)]
-            position += 1
+            items: List[Tuple[Optional[str], str]] = [_XML_NAMESPACE_ITEM]
             if self.nsmap:
-                for pfx, uri in self.nsmap.items():
-                    if pfx != 'xml':
-                        self._namespace_nodes.append(NamespaceNode(pfx, uri, self, position))
-                        position += 1
+                items.extend(x for x in self.nsmap.items() if x[0] != 'xml')
+
+            self._namespace_nodes = [
+                NamespaceNode(pfx, uri, self, pos)
+                for pos, (pfx, uri) in enumerate(items, self.position + 1)
+            ]
 
         return self._namespace_nodes
 
     @property
     def attributes(self) -> List['AttributeNode']:
         if self._attributes is None:
-            position = self.position + len(self.nsmap) + int('xml' not in self.nsmap)
+            # Attribute positions follow the ones reserved for namespace nodes
+            nsmap = self.nsmap
+            position = self.position + len(nsmap) + (1 if 'xml' not in nsmap else 0) + 1
             self._attributes = [
                 AttributeNode(name, cast(str, value), self, pos)
                 for pos, (name, value) in enumerate(self.elem.attrib.items(), position)
@@ -593,21 +743,42 @@ class ElementNode(XPathNode):
     is_schema_element = is_schema_node
 
     def match_name(self, name: str, default_namespace: Optional[str] = None) -> bool:
+        tag = self._update_name_parts()
         if '*' in name:
-            return match_wildcard(self.elem.tag, name)
+            return _match_wildcard(tag, self._namespace, self._local_name, name)
         elif not name:
-            return not self.elem.tag
-        elif hasattr(self.elem, 'type'):
-            return cast(XsdElementProtocol, self.elem).is_matching(name, default_namespace)
-        elif name[0] == '{' or default_namespace is None:
-            return self.elem.tag == name
+            return not tag
+        elif name[0] == '{':
+            return tag == name
+        elif default_namespace is not None:
+            # lxml element in-scope namespaces override the default namespace
+            default_namespace = self.nsmap.get(None, default_namespace)
 
-        if None in self.nsmap:
-            default_namespace = self.nsmap[None]  # lxml element in-scope namespaces
+        if not isinstance(tag, str):
+            # Not a plain name (e.g. an ElementTree QName): compare the full tag
+            return tag == (f'{{{default_namespace}}}{name}' if default_namespace else name)
 
-        if default_namespace:
-            return self.elem.tag == '{%s}%s' % (default_namespace, name)
-        return self.elem.tag == name
+        # Compare the precomputed parts, so the expanded name is not rebuilt
+        return self._local_name == name and self._namespace == (default_namespace or '')
+
+    def get_child_position(self, child: ChildNodeType) -> int:
+        """
+        Returns the position of a child node among the siblings of the same kind
+        and name, starting from 1. Positions are computed for all the children at
+        once and cached, the map is rebuilt if the child is not found in it (e.g.
+        a child appended after the last build). Raises `KeyError` if the argument
+        is not a child of the node.
+        """
+        positions = self._child_positions
+        if positions is None or id(child) not in positions:
+            positions = self._child_positions = {}
+            counters: Dict[Tuple[str, Optional[str]], int] = {}
+            for node in self:
+                key = node.kind, node.name
+                counters[key] = counters.get(key, 0) + 1
+                positions[id(node)] = counters[key]
+
+        return positions[id(child)]
 
     def get_element_node(self, elem: Union[ElementProtocol, SchemaElemType]) \
             -> Optional['ElementNode']:
@@ -625,13 +796,15 @@ class ElementNode(XPathNode):
         # Iterate the tree not including the not built lazy components.
         yield self
 
-        iterators: List[Any] = []
-        children: Iterator[Any] = iter(self.children)
-
         if self._namespace_nodes:
             yield from self._namespace_nodes
         if self._attributes:
             yield from self._attributes
+        if not self.children:
+            return  # a leaf element, skip the traversal setup
+
+        iterators: List[Any] = []
+        children: Iterator[Any] = iter(self.children)
 
         while True:
             for child in children:
@@ -669,6 +842,8 @@ class ElementNode(XPathNode):
     def iter_descendants(self, with_self: bool = True) -> Iterator[ChildNodeType]:
         if with_self:
             yield self
+        if not self.children:
+            return
 
         iterators: List[Any] = []
         children: Iterator[Any] = iter(self.children)
@@ -773,7 +948,7 @@ class DocumentNode(XPathNode):
         return len(self.children)
 
     def __iter__(self) -> Iterator[ChildNodeType]:
-        yield from self.children
+        return iter(self.children)
 
     @property
     def value(self) -> DocumentProtocol:
@@ -814,10 +989,10 @@ class DocumentNode(XPathNode):
             return not isinstance(self.children[0], ElementNode)
         elif not hasattr(root, 'itersiblings'):
             return True  # an extended xml.etree.ElementTree structure
-        elif any(isinstance(x, TextNode) for x in root):
+        elif any(isinstance(x, TextNode) for x in self.children):
             return True
         else:
-            return sum(isinstance(x, ElementNode) for x in root) != 1
+            return _get_single_element(self.children) is None
 
     @classmethod
     def from_element_node(cls, root_node: ElementNode, replace: bool = True) -> 'DocumentNode':
@@ -828,20 +1003,22 @@ class DocumentNode(XPathNode):
         :param replace: if `True` the root element is replaced by a document node. \
         This is usually useful for extended data models (more element children, text nodes).
         """
+        # The module of the element class is already loaded: get it without
+        # passing through the import machinery, that takes the import lock.
         etree_module_name = root_node.elem.__class__.__module__
-        etree: ModuleType = import_module(etree_module_name)
+        etree: ModuleType = sys.modules.get(etree_module_name) \
+            or import_module(etree_module_name)
 
         assert root_node.elements is not None, "Not a root element node"
         assert all(not isinstance(x, SchemaElementNode) for x in root_node.elements)
         elements = cast(Dict[ElementProtocol, ElementNode], root_node.elements)
 
         if replace:
-            document = etree.ElementTree()
-            if sum(isinstance(x, ElementNode) for x in root_node.children) == 1:
-                for child in root_node.children:
-                    if isinstance(child, ElementNode):
-                        document = etree.ElementTree(child.elem)
-                        break
+            element_node = _get_single_element(root_node.children)
+            if element_node is not None:
+                document = etree.ElementTree(element_node.elem)
+            else:
+                document = etree.ElementTree()
 
             document_node = cls(document, root_node.uri, root_node.position)
             for child in root_node.children:
@@ -891,18 +1068,30 @@ class LazyElementNode(ElementNode):
                     if elem.tail is not None:
                         self.children.append(TextNode(elem.tail, self))
 
-        yield from self.children
+        return iter(self.children)
 
     def iter_descendants(self, with_self: bool = True) -> Iterator[ChildNodeType]:
         if with_self:
             yield self
 
-        for child in self:
-            if isinstance(child, ElementNode):
-                yield from child.iter_descendants()
-            else:
+        # Use iter(child) instead of child.children for building children on demand
+        iterators: List[Any] = []
+        children: Iterator[Any] = iter(self)
+
+        while True:
+            for child in children:
                 yield child
 
+                if isinstance(child, ElementNode):
+                    iterators.append(children)
+                    children = iter(child)
+                    break
+            else:
+                try:
+                    children = iterators.pop()
+                except IndexError:
+                    return
+
 
 class SchemaElementNode(ElementNode):
     """
@@ -910,21 +1099,51 @@ class SchemaElementNode(ElementNode):
     The resulting structure can be a tree or a set of disjoint trees.
     With more roots only one of them is the schema node.
     """
-    __slots__ = ()
-
-    ref: Optional['SchemaElementNode'] = None
+    ref: Optional['SchemaElementNode']
     elem: SchemaElemType
+    _xsd_element: Optional[XsdElementProtocol]
+
+    __slots__ = 'ref', '_xsd_element'
+
+    def __init__(self,
+                 elem: SchemaElemType,
+                 parent: Optional[Union['ElementNode', 'DocumentNode']] = None,
+                 position: int = 1,
+                 nsmap: Optional[MutableMapping[Any, str]] = None,
+                 xsd_type: Optional[XsdTypeProtocol] = None) -> None:
+        self.ref = None
+        # The wrapped XSD element, None for the schema node. Checked once, because
+        # the kind of the wrapped schema component does not change.
+        self._xsd_element = cast(XsdElementProtocol, elem) if hasattr(elem, 'type') else None
+        super().__init__(elem, parent, position, nsmap, xsd_type)
 
     def __iter__(self) -> Iterator[ChildNodeType]:
         if self.ref is None:
-            yield from self.children
+            return iter(self.children)
         else:
-            yield from self.ref.children
+            return iter(self.ref.children)
+
+    def is_schema_node(self) -> bool:
+        return self._xsd_element is not None
+
+    is_schema_element = is_schema_node
+
+    def match_name(self, name: str, default_namespace: Optional[str] = None) -> bool:
+        if '*' in name:
+            tag = self._update_name_parts()
+            return _match_wildcard(tag, self._namespace, self._local_name, name)
+        elif not name:
+            return not self.elem.tag
+        elif self._xsd_element is not None:
+            return self._xsd_element.is_matching(name, default_namespace)
+        return super().match_name(name, default_namespace)
 
     @property
     def attributes(self) -> List['AttributeNode']:
         if self._attributes is None:
-            position = self.position + len(self.nsmap) + int('xml' not in self.nsmap)
+            # Attribute positions follow the ones reserved for namespace nodes
+            nsmap = self.nsmap
+            position = self.position + len(nsmap) + (1 if 'xml' not in nsmap else 0) + 1
             self._attributes = [
                 AttributeNode(name, attr, self, pos, attr.type)
                 for pos, (name, attr) in enumerate(self.elem.attrib.items(), position)
@@ -943,28 +1162,28 @@ class SchemaElementNode(ElementNode):
 
     @property
     def string_value(self) -> str:
-        if not hasattr(self.elem, 'type'):
+        if self._xsd_element is None:
             return ''
-        schema_node = cast(XsdElementProtocol, self.elem)
-        return str(get_atomic_value(schema_node.type))
+        return str(get_atomic_value(self._xsd_element.type))
 
     @property
     def typed_value(self) -> Optional[AtomicValueType]:
-        if not hasattr(self.elem, 'type'):
+        if self._xsd_element is None:
             return UntypedAtomic('')
-        schema_node = cast(XsdElementProtocol, self.elem)
-        return get_atomic_value(schema_node.type)
+        return get_atomic_value(self._xsd_element.type)
 
     def iter(self) -> Iterator[XPathNode]:
         yield self
 
-        iterators: List[Any] = []
-        children: Iterator[Any] = iter(self.children)
-
         if self._namespace_nodes:
             yield from self._namespace_nodes
         if self._attributes:
             yield from self._attributes
+        if not self.children:
+            return
+
+        iterators: List[Any] = []
+        children: Iterator[Any] = iter(self.children)
 
         elements = {self}
         while True:
@@ -993,6 +1212,8 @@ class SchemaElementNode(ElementNode):
     def iter_descendants(self, with_self: bool = True) -> Iterator[ChildNodeType]:
         if with_self:
             yield self
+        if not self.children:
+            return
 
         iterators: List[Any] = []
         children: Iterator[Any] = iter(self.children)
@@ -1019,5 +1240,16 @@ class SchemaElementNode(ElementNode):
                     return
 
 
+def _get_single_element(children: List[ChildNodeType]) -> Optional[ElementNode]:
+    """Returns the only element node of a list of children, `None` otherwise."""
+    element_node = None
+    for child in children:
+        if isinstance(child, ElementNode):
+            if element_node is not None:
+                return None  # stop at the second element
+            element_node = child
+    return element_node
+
+
 def is_xpath_node(obj: Any) -> bool:
     return isinstance(obj, XPathNode) or is_etree_element(obj) or is_etree_document(obj)
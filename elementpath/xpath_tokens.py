@@ -37,7 +37,6 @@ from .datatypes import xsd10_atomic_types, AbstractDateTime, AnyURI, \
 from .protocols import ElementProtocol, DocumentProtocol, XsdAttributeProtocol, \
     XsdElementProtocol, XsdTypeProtocol, XsdSchemaProtocol
 from .sequence_types import is_sequence_type_restriction, match_sequence_type
-from .schema_proxy import AbstractSchemaProxy
 from .tdop import Token, MultiLabel
 from .xpath_context import XPathContext, XPathSchemaContext
 
@@ -64,6 +63,7 @@ _LEAF_ELEMENTS_TOKENS = {
     'following-sibling', 'preceding-sibling', 'ancestor', 'ancestor-or-self',
     'descendant', 'descendant-or-self', 'following', 'preceding'
 }
+_NO_ITEM = object()  # A sentinel for detecting the end of a selection
 
 # Type annotations aliases
 NargsType = Optional[Union[int, Tuple[int, Optional[int]]]]
@@ -102,7 +102,7 @@ class XPathToken(Token[XPathTokenType]):
 
         :param context: The XPath dynamic context.
         """
-        return [x for x in self.select(context)]
+        return list(self.select(context))
 
     def select(self, context: ContextArgType = None) -> Iterator[Any]:
         """
@@ -212,17 +212,19 @@ class XPathToken(Token[XPathTokenType]):
         returning QNames in prefixed format. A leaf element is an element
         positioned at last path step. Does not consider kind tests and wildcards.
         """
-        if self.symbol in ('(name)', ':'):
-            yield cast(str, self.value)
-        elif self.symbol in ('//', '/'):
-            if self._items[-1].symbol in _LEAF_ELEMENTS_TOKENS:
-                yield from self._items[-1].iter_leaf_elements()
-
-        elif self.symbol in ('[',):
-            yield from self._items[0].iter_leaf_elements()
-        else:
-            for tk in self._items:
-                yield from tk.iter_leaf_elements()
+        tokens = [self]
+        while tokens:
+            tk = tokens.pop()
+            if tk.symbol in ('(name)', ':'):
+                yield cast(str, tk.value)
+            elif tk.symbol in ('//', '/'):
+                if tk._items[-1].symbol in _LEAF_ELEMENTS_TOKENS:
+                    tokens.append(tk._items[-1])
+
+            elif tk.symbol in ('[',):
+                tokens.append(tk._items[0])
+            else:
+                tokens.extend(reversed(tk._items))
 
     def parse_sequence_type(self) -> 'XPathToken':
         if self.parser.next_token.label in ('kind test', 'sequence type', 'function test'):
@@ -301,27 +303,26 @@ class XPathToken(Token[XPathTokenType]):
             if isinstance(token, XPathFunction) and token.is_reference():
                 return token  # It's a function reference
 
-            item = None
-            for k, result in enumerate(token.select(copy(context))):
-                if k == 0:
-                    item = result
-                elif self.parser.compatibility_mode:
-                    break
-                elif isinstance(context, XPathSchemaContext):
-                    # Multiple schema nodes are ignored but do not raise. The target
-                    # of schema context selection is XSD type association and multiple
-                    # node coherency is already checked at schema level.
-                    break
-                else:
+            if token.symbol not in ('(string)', '(integer)', '(decimal)', '(float)', '$'):
+                context = copy(context)  # literals and variable references don't change it
+
+            selector = token.select(context)
+            item = next(selector, None)
+            if next(selector, _NO_ITEM) is not _NO_ITEM:
+                # In compatibility mode only the first item is used. Multiple schema
+                # nodes are ignored but do not raise. The target of schema context
+                # selection is XSD type association and multiple node coherency is
+                # already checked at schema level.
+                if not self.parser.compatibility_mode and \
+                        not isinstance(context, XPathSchemaContext):
                     msg = "a sequence of more than one item is not allowed as argument"
                     raise self.error('XPTY0004', msg)
-            else:
-                if item is None:
-                    if not required or isinstance(context, XPathSchemaContext):
-                        return default
-                    ord_arg = ordinal(index + 1)
-                    msg = "A not empty sequence required for {} argument"
-                    raise self.error('XPTY0004', msg.format(ord_arg))
+            elif item is None:
+                if not required or isinstance(context, XPathSchemaContext):
+                    return default
+                ord_arg = ordinal(index + 1)
+                msg = "A not empty sequence required for {} argument"
+                raise self.error('XPTY0004', msg.format(ord_arg))
 
         if cls is not None:
             return self.validated_value(item, cls, promote, index)
@@ -502,8 +503,8 @@ class XPathToken(Token[XPathTokenType]):
         right_values: Any
 
         if self.parser.compatibility_mode:
-            left_values = [x for x in self._items[0].atomization(copy(context))]
-            right_values = [x for x in self._items[1].atomization(copy(context))]
+            left_values = list(self._items[0].atomization(copy(context)))
+            right_values = list(self._items[1].atomization(copy(context)))
             # Boolean comparison if one of the results is a single boolean value (1.)
             try:
                 if isinstance(left_values[0], bool):
@@ -525,24 +526,27 @@ class XPathToken(Token[XPathTokenType]):
                 yield from product(left_values, right_values)
                 return
         else:
-            left_values = self._items[0].atomization(copy(context))
+            left_values = list(self._items[0].atomization(copy(context)))
+            if not left_values and not isinstance(context, XPathSchemaContext):
+                return  # No couples to compare, skip the right operand
             right_values = self._items[1].atomization(copy(context))
 
         for values in product(left_values, right_values):
-            if any(isinstance(x, bool) for x in values):
-                if any(isinstance(x, (str, Integer)) for x in values):
+            value1, value2 = values
+            if isinstance(value1, bool) or isinstance(value2, bool):
+                if isinstance(value1, (str, Integer)) or isinstance(value2, (str, Integer)):
                     msg = "cannot compare {!r} and {!r}"
-                    raise TypeError(msg.format(type(values[0]), type(values[1])))
-            elif any(isinstance(x, Integer) for x in values) and \
-                    any(isinstance(x, str) for x in values):
+                    raise TypeError(msg.format(type(value1), type(value2)))
+            elif isinstance(value1, Integer) and isinstance(value2, str) or \
+                    isinstance(value1, str) and isinstance(value2, Integer):
                 msg = "cannot compare {!r} and {!r}"
-                raise TypeError(msg.format(type(values[0]), type(values[1])))
-            elif any(isinstance(x, float) for x in values):
-                if isinstance(values[0], decimal.Decimal):
-                    yield float(values[0]), values[1]
+                raise TypeError(msg.format(type(value1), type(value2)))
+            elif isinstance(value1, float) or isinstance(value2, float):
+                if isinstance(value1, decimal.Decimal):
+                    yield float(value1), value2
                     continue
-                elif isinstance(values[1], decimal.Decimal):
-                    yield values[0], float(values[1])
+                elif isinstance(value2, decimal.Decimal):
+                    yield value1, float(value2)
                     continue
 
             yield values
@@ -586,7 +590,7 @@ class XPathToken(Token[XPathTokenType]):
         """
         item = None
         if context is None:
-            results = [x for x in self.select(context)]
+            results = list(self.select(context))
         else:
             self.parser.check_variables(context.variables)
 
@@ -685,7 +689,8 @@ class XPathToken(Token[XPathTokenType]):
         if not base_uri:
             base_uri = self.parser.base_uri
 
-        uri_parts: urllib.parse.ParseResult = urllib.parse.urlparse(uri)
+        # urlsplit() results are cached by the standard library, urlparse() rebuilds them
+        uri_parts: urllib.parse.SplitResult = urllib.parse.urlsplit(uri)
         if uri_parts.scheme or uri_parts.netloc or base_uri is None:
             return uri if as_string else AnyURI(uri)
 
@@ -791,7 +796,7 @@ class XPathToken(Token[XPathTokenType]):
                     _item += timezone.offset - _tzinfo.offset
                 elif timezone.offset < _tzinfo.offset:
                     _item -= timezone.offset - _tzinfo.offset
-                    _item -= DayTimeDuration.fromstring('P1D')
+                    _item -= DayTimeDuration(86400)  # P1D, without parsing
         except OverflowError as err:
             if isinstance(context, XPathSchemaContext):
                 return _item
@@ -899,8 +904,8 @@ class XPathToken(Token[XPathTokenType]):
 
         :param item: a string or an AttributeNode or an element.
         """
-        if not self.xsd_types or isinstance(self.xsd_types, AbstractSchemaProxy):
-            return None
+        if not self.xsd_types or not isinstance(self.xsd_types, dict):
+            return None  # No associations or a schema proxy (cheaper than an ABC check)
         elif isinstance(item, AttributeNode):
             if item.xsd_type is not None:
                 return item.xsd_type
@@ -1007,7 +1012,9 @@ class XPathToken(Token[XPathTokenType]):
         """
         The effective boolean value, as computed by fn:boolean().
         """
-        if isinstance(obj, list):
+        if obj.__class__ is bool:
+            return cast(bool, obj)
+        elif isinstance(obj, list):
             if not obj:
                 return False
             elif isinstance(obj[0], XPathNode):
@@ -1018,6 +1025,8 @@ class XPathToken(Token[XPathTokenType]):
                 raise self.error('FORG0006', message)
             else:
                 obj = obj[0]
+                if obj.__class__ is bool:
+                    return cast(bool, obj)
 
         if isinstance(obj, (int, str, UntypedAtomic, AnyURI)):  # Include bool
             return bool(obj)
@@ -1500,7 +1509,7 @@ class XPathFunction(XPathToken):
         elif sequence_types[0] == '*':
             return True
 
-        signature = [x for x in self.sequence_types[:self.arity]]
+        signature = list(self.sequence_types[:self.arity])
         signature.append(self.sequence_types[-1])
 
         if len(sequence_types) != len(signature):
@@ -1566,7 +1575,7 @@ class XPathFunction(XPathToken):
         return wrapper
 
     def _partial_evaluate(self, context: ContextArgType = None) -> Any:
-        return [x for x in self._partial_select(context)]
+        return list(self._partial_select(context))
 
     def _partial_select(self, context: ContextArgType = None) -> Iterator[Any]:
         item = self._partial_evaluate(context)
@@ -1745,8 +1754,8 @@ class XPathMap(XPathFunction):
 
     def values(self, context: ContextArgType = None) -> List[Any]:
         if self._map is not None:
-            return [v for v in self._map.values()]
-        return [v for v in self._evaluate(context).values()]
+            return list(self._map.values())
+        return list(self._evaluate(context).values())
 
     def items(self, context: ContextArgType = None) -> List[Tuple[AnyAtomicType, Any]]:
         _map: Dict[Any, Any]
@@ -1794,7 +1803,7 @@ class XPathArray(XPathFunction):
     def __init__(self, parser: XPathParserType,
                  items: Optional[Iterable[Any]] = None) -> None:
         if items is not None:
-            self._array = [x for x in items]
+            self._array = list(items)
         super().__init__(parser)
 
     def __repr__(self) -> str:
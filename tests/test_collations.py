@@ -9,6 +9,7 @@
 # @author Davide Brunato <brunato@sissa.it>
 #
 import unittest
+import locale
 
 from elementpath import ElementPathError
 from elementpath.collations import UNICODE_CODEPOINT_COLLATION, \
@@ -43,6 +44,25 @@ class CollationsTest(unittest.TestCase):
         self.assertIn('FOCH0002', str(ctx.exception))
         self.assertIn("Unsupported collation 'unknown'", str(ctx.exception))
 
+    def test_locale_collation(self):
+        lc_collate = locale.setlocale(locale.LC_COLLATE, None)
+        try:
+            with CollationManager('C.UTF-8') as manager:
+                self.assertTrue(manager.eq('a', 'a'))
+        except ElementPathError:
+            self.skipTest("C.UTF-8 locale is not available")
+
+        self.assertEqual(locale.setlocale(locale.LC_COLLATE, None), lc_collate)
+
+        # Restores an ambient locale whose getlocale() name can't be set back
+        locale.setlocale(locale.LC_COLLATE, 'C.UTF-8')
+        try:
+            with CollationManager('C') as manager:
+                self.assertFalse(manager.eq('a', 'A'))
+            self.assertEqual(locale.setlocale(locale.LC_COLLATE, None), 'C.UTF-8')
+        finally:
+            locale.setlocale(locale.LC_COLLATE, lc_collate)
+
     def test_html_ascii_case_insensitive_collation(self):
         with CollationManager(HTML_ASCII_CASE_INSENSITIVE_COLLATION) as manager:
             self.assertTrue(manager.eq('a', 'A'))
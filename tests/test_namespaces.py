@@ -26,6 +26,8 @@ class NamespacesTest(unittest.TestCase):
         self.assertEqual(get_namespace('{ns}foo'), 'ns')
         self.assertEqual(get_namespace('{}foo'), '')
         self.assertEqual(get_namespace('{A}B{C}'), 'A')
+        self.assertEqual(get_namespace('{A'), '')
+        self.assertEqual(get_namespace(''), '')
 
     def test_qname_to_prefixed_function(self):
         self.assertEqual(get_prefixed_name('{ns}foo', {'bar': 'ns'}), 'bar:foo')
@@ -36,6 +38,10 @@ class NamespacesTest(unittest.TestCase):
         self.assertEqual(get_prefixed_name('{ns}foo', {}), '{ns}foo')
         self.assertEqual(get_prefixed_name('{ns}foo', {'bar': 'other'}), '{ns}foo')
 
+        namespaces = {'a': 'ns', 'c': 'ns', None: 'ns', 'b': 'other'}
+        self.assertEqual(get_prefixed_name('{ns}foo', namespaces), 'c:foo')
+        self.assertEqual(get_prefixed_name('{ns}foo', {None: 'ns', 'a': 'other'}), 'foo')
+
         with self.assertRaises(ValueError):
             get_prefixed_name('{{ns}}foo', {'bar': 'ns'})
 
@@ -115,6 +115,21 @@ class TreeBuildersTest(unittest.TestCase):
         self.assertIsInstance(node.children[9], ProcessingInstructionNode)
         self.assertIsInstance(node.children[10], TextNode)
 
+    @unittest.skipIf(sys.version_info <= (3, 8),
+                     "Processing instructions not available in ElementTree")
+    def test_build_node_tree_positions(self):
+        parser = ElementTree.XMLParser(
+            target=ElementTree.TreeBuilder(
+                insert_comments=True, insert_pis=True
+            )
+        )
+        root = ElementTree.XML('<A><?pi1 x?><?pi2 y?><!--c-->t<B a="1"/></A>', parser=parser)
+        node = build_node_tree(root)
+
+        positions = [x.position for x in node.iter_document()]
+        self.assertListEqual(positions, sorted(set(positions)))
+        self.assertLess(node[0].position, node[1].position)
+
     @unittest.skipIf(lxml_etree is None, "lxml library is not installed")
     def test_build_lxml_node_tree_with_element(self):
         root = lxml_etree.XML(XML_DATA.encode('utf-8'))
@@ -154,6 +169,15 @@ class TreeBuildersTest(unittest.TestCase):
         self.assertIsInstance(node.children[5], ElementNode)
         self.assertIsInstance(node.children[6], TextNode)
 
+    @unittest.skipIf(lxml_etree is None, "lxml library is not installed")
+    def test_build_lxml_node_tree_positions(self):
+        root = lxml_etree.XML('<A><?pi1 x?><?pi2 y?><!--c-->t<B a="1"/></A>')
+        node = build_lxml_node_tree(root)
+
+        positions = [x.position for x in node.iter_document()]
+        self.assertListEqual(positions, sorted(set(positions)))
+        self.assertLess(node[0].position, node[1].position)
+
     @unittest.skipIf(lxml_etree is None, "lxml library is not installed")
     def test_build_lxml_node_tree_with_element_tree(self):
         root = lxml_etree.parse(io.BytesIO(XML_DATA.encode('utf-8')))
@@ -20,6 +20,7 @@
 #           https://www.w3.org/TR/charmod-norm/
 #
 import unittest
+import sys
 import io
 import math
 import pickle
@@ -313,6 +314,10 @@ class XPath1ParserTest(xpath_test_class.XPathTestCase):
         self.check_value("B2", [context.root[1], context.root[3]], context=context)
         self.check_value("B4", [], context=context)
 
+        token = self.parser.parse(''.join(['B', '1']))
+        self.assertIs(token.value, sys.intern('B1'))
+        self.assertIs(context.root[0].local_name, token.value)
+
     def test_prefixed_references(self):
         namespaces = {'tst': "http://xpath.test/ns"}
         root = self.etree.XML("""
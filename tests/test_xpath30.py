@@ -1316,6 +1316,44 @@ class XPath30FunctionsTest(test_xpath2_functions.XPath2FunctionsTest):
         ]
         self.assertListEqual(paths, expected)
 
+    def test_name_related_functions_after_rename(self):
+        root = self.etree.XML('<A><B/></A>')
+        context = XPathContext(root)
+        self.check_value('count(B)', 1, context)
+        self.check_value('name(*[1])', 'B', context)
+
+        root[0].tag = 'X'
+        self.check_value('count(X)', 1, context)
+        self.check_value('count(B)', 0, context)
+        self.check_value('name(*[1])', 'X', context)
+        self.check_value('local-name(*[1])', 'X', context)
+        self.check_value('path(*[1])',
+                         f'Q{{{XPATH_FUNCTIONS_NAMESPACE}}}root()/Q{{}}X[1]', context)
+
+    def test_path_function_with_comments_and_pis(self):
+        if self.etree is not lxml_etree:
+            self.skipTest("ElementTree parser doesn't keep comments and PIs")
+
+        root = self.etree.parse(io.StringIO(
+            '<root><!--c1--><a/><?pi1 x?><a><!--c2--><?pi1 y?><?pi2?><!--c3--></a></root>'
+        ))
+        paths = select(root, '//comment()/path()', parser=self.parser.__class__)
+        expected = [
+            '/Q{}root[1]/comment()[1]',
+            '/Q{}root[1]/Q{}a[2]/comment()[1]',
+            '/Q{}root[1]/Q{}a[2]/comment()[2]',
+        ]
+        self.assertListEqual(paths, expected)
+
+        paths = select(root, '//processing-instruction()/path()',
+                       parser=self.parser.__class__)
+        expected = [
+            '/Q{}root[1]/processing-instruction(pi1)[1]',
+            '/Q{}root[1]/Q{}a[2]/processing-instruction(pi1)[1]',
+            '/Q{}root[1]/Q{}a[2]/processing-instruction(pi2)[1]',
+        ]
+        self.assertListEqual(paths, expected)
+
 
 @unittest.skipIf(lxml_etree is None, "The lxml library is not installed")
 class LxmlXPath30FunctionsTest(XPath30FunctionsTest):
@@ -14,6 +14,11 @@ from textwrap import dedent
 import io
 import xml.etree.ElementTree as ElementTree
 
+try:
+    import lxml.etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
 try:
     import xmlschema
 except ImportError:
@@ -21,10 +26,11 @@ except ImportError:
 else:
     xmlschema.XMLSchema.meta_schema.build()
 
+from elementpath.datatypes import UntypedAtomic
 from elementpath.etree import is_etree_element, etree_iter_strings, \
     etree_deep_equal, etree_iter_paths
 from elementpath.xpath_nodes import DocumentNode, ElementNode, AttributeNode, TextNode, \
-    NamespaceNode, CommentNode, ProcessingInstructionNode
+    NamespaceNode, CommentNode, ProcessingInstructionNode, LazyElementNode
 from elementpath.tree_builders import get_node_tree
 from elementpath.xpath_context import XPathContext, XPathSchemaContext
 
@@ -110,6 +116,29 @@ class XPathNodesTest(unittest.TestCase):
         attr = AttributeNode('{http://xpath.test/ns}a1', '10', parent=None)
         self.assertTrue(attr.match_name('*:a1'))
 
+        elem = ElementNode(ElementTree.Element('{http://xpath.test/ns}A'))
+        self.assertTrue(elem.match_name('{http://xpath.test/ns}A'))
+        self.assertTrue(elem.match_name('A', 'http://xpath.test/ns'))
+        self.assertFalse(elem.match_name('A'))
+        self.assertFalse(elem.match_name('A', ''))
+        self.assertTrue(elem.match_name('*:A'))
+        self.assertTrue(elem.match_name('{http://xpath.test/ns}*'))
+        self.assertFalse(elem.match_name('{http://xpath.test}*'))
+        self.assertFalse(elem.match_name('*:B'))
+
+        elem = ElementNode(ElementTree.Element('A'))
+        self.assertTrue(elem.match_name('*:A'))
+        self.assertFalse(elem.match_name('{}*'))
+        self.assertTrue(elem.match_name('A'))
+        self.assertTrue(elem.match_name('A', ''))
+        self.assertFalse(elem.match_name('A', 'http://xpath.test/ns'))
+        self.assertFalse(elem.match_name('{http://xpath.test/ns}A'))
+
+        elem = ElementNode(ElementTree.Element('{http://xpath.test/ns}A'),
+                           nsmap={None: 'http://xpath.test/ns'})
+        self.assertTrue(elem.match_name('A', ''))
+        self.assertFalse(elem.match_name('A'))
+
     def test_node_base_uri(self):
         xml_test = '<A xmlns:xml="http://www.w3.org/XML/1998/namespace" xml:base="/" />'
 
@@ -151,6 +180,20 @@ class XPathNodesTest(unittest.TestCase):
         self.assertEqual(root_node[7].base_uri, 'urn:ietf:rfc:2648')
         self.assertEqual(root_node[9].base_uri, 'urn:uuid:6e8bc430-9c3a-11d9-9669-0800200c9a66')
 
+        root_node = get_node_tree(ElementTree.XML('<A><B/></A>'))
+        self.assertIsNone(root_node[0].base_uri)
+
+        root_node.uri = 'http://example.test/xpath/'
+        self.assertEqual(root_node.base_uri, 'http://example.test/xpath/')
+        self.assertEqual(root_node[0].base_uri, 'http://example.test/xpath/')
+
+        root_node[0].elem.set('{http://www.w3.org/XML/1998/namespace}base', 'sub/')
+        self.assertEqual(root_node[0].base_uri, 'http://example.test/xpath/sub/')
+
+        other_node = get_node_tree(ElementTree.XML('<C xml:base="http://other.test/"/>'))
+        root_node[0].parent = other_node
+        self.assertEqual(root_node[0].base_uri, 'http://other.test/sub/')
+
     def test_node_document_uri_function(self):
         node = ElementNode(self.elem)
         self.assertIsNone(node.document_uri)
@@ -204,6 +247,107 @@ class XPathNodesTest(unittest.TestCase):
             attribute.xsd_type = xsd_type
             self.assertEqual(attribute.as_item(), ('value', '10'))
 
+    def test_attribute_node_id_properties(self):
+        attribute = AttributeNode('{http://www.w3.org/XML/1998/namespace}id', 'x1')
+        self.assertTrue(attribute.is_id)
+        self.assertFalse(attribute.is_idrefs)
+
+        attribute = AttributeNode('refs', 'x1 x2')
+        self.assertFalse(attribute.is_id)
+        self.assertFalse(attribute.is_idrefs)
+
+        xsd_type = DummyXsdType()
+        xsd_type.root_type = DummyXsdType()
+        xsd_type.root_type.name = '{http://www.w3.org/2001/XMLSchema}IDREFS'
+        with patch.object(xsd_type, 'is_key', return_value=False) as is_key:
+            attribute.xsd_type = xsd_type
+            self.assertFalse(attribute.is_id)
+            self.assertTrue(attribute.is_idrefs)
+            is_key.assert_called_once()
+
+        attribute.xsd_type = None
+        self.assertFalse(attribute.is_idrefs)
+
+    def test_element_node_attributes(self):
+        context = XPathContext(ElementTree.XML('<A a="1"><B1/><B2 b="2"/><B3/></A>'))
+        self.assertListEqual([x.as_item() for x in context.root.attributes], [('a', '1')])
+        self.assertListEqual(context.root[0].attributes, [])
+        self.assertIsNot(context.root[0].attributes, context.root[2].attributes)
+        self.assertGreater(context.root[1].attributes[0].position, context.root[1].position)
+
+        root = ElementTree.XML('<A xmlns:tns="http://foo.test" a="1" b="2"><B/></A>')
+        context = XPathContext(root, namespaces={'tns': 'http://foo.test'})
+        positions = [x.position for x in context.root.iter_document()]
+        self.assertListEqual(positions, sorted(set(positions)))
+
+    def test_attribute_node_typed_value(self):
+        attribute = AttributeNode('value', '10', self.context.root)
+        self.assertEqual(attribute.typed_value, '10')
+        self.assertIsNone(attribute._typed_value)
+
+        xsd_type = DummyXsdType()
+        with patch.object(xsd_type, 'decode', return_value=10) as decode:
+            attribute.xsd_type = xsd_type
+            self.assertEqual(attribute.typed_value, 10)
+            self.assertEqual(attribute.typed_value, 10)
+            decode.assert_called_once_with('10')
+
+        xsd_type = DummyXsdType()
+        with patch.object(xsd_type, 'decode', return_value=20) as decode:
+            attribute.xsd_type = xsd_type
+            self.assertEqual(attribute.typed_value, 20)
+            decode.assert_called_once_with('10')
+
+            attribute.value = '2'
+            decode.return_value = 2
+            self.assertEqual(attribute.typed_value, 2)
+            self.assertEqual(decode.call_count, 2)
+
+    def test_element_node_string_value(self):
+        root = ElementTree.XML('<A>a<B1>b</B1><B2/>c</A>')
+        context = XPathContext(root)
+        self.assertEqual(context.root.string_value, 'abc')
+        self.assertEqual(context.root[1].string_value, 'b')
+        self.assertEqual(context.root[2].string_value, '')
+        self.assertIsInstance(context.root[2].typed_value, UntypedAtomic)
+        self.assertEqual(context.root[2].typed_value, '')
+
+    def test_element_node_typed_value(self):
+        element = ElementTree.XML('<A>10</A>')
+        context = XPathContext(element)
+        self.assertEqual(context.root.typed_value, '10')
+        self.assertIsNone(context.root._typed_value)
+
+        xsd_type = DummyXsdType()
+        with patch.object(xsd_type, 'decode', return_value=10) as decode:
+            context.root.xsd_type = xsd_type
+            self.assertEqual(context.root.typed_value, 10)
+            self.assertEqual(context.root.typed_value, 10)
+            decode.assert_called_once_with('10')
+
+            element.text = '20'
+            decode.return_value = 20
+            self.assertEqual(context.root.typed_value, 20)
+            self.assertEqual(decode.call_count, 2)
+
+    @unittest.skipIf(lxml_etree is None, 'lxml library is not installed')
+    def test_lxml_element_node_typed_value(self):
+        # lxml returns a new text string at each access
+        element = lxml_etree.XML('<A>10</A>')
+        context = XPathContext(element)
+
+        xsd_type = DummyXsdType()
+        with patch.object(xsd_type, 'decode', return_value=10) as decode:
+            context.root.xsd_type = xsd_type
+            for _ in range(5):
+                self.assertEqual(context.root.typed_value, 10)
+            decode.assert_called_once_with('10')
+
+            element.text = '20'
+            decode.return_value = 20
+            self.assertEqual(context.root.typed_value, 20)
+            self.assertEqual(decode.call_count, 2)
+
     def test_typed_element_nodes(self):
         element = ElementTree.Element('schema')
 
@@ -256,6 +400,16 @@ class XPathNodesTest(unittest.TestCase):
         self.assertEqual(namespace.as_item(), ('tns', 'http://xpath.test/ns'))
         self.assertNotEqual(namespace, NamespaceNode('tns', 'http://xpath.test/ns'))
 
+        uri = ''.join(['http://xpath.test/', 'ns'])
+        self.assertIs(NamespaceNode('tns', uri).uri, namespace.uri)
+
+        elem = ElementNode(self.elem, nsmap={'tns': 'http://xpath.test/ns', 'xml': 'foo'})
+        self.assertIsNone(elem._namespace_nodes)
+        self.assertListEqual([(x.prefix, x.uri, x.position) for x in elem.namespace_nodes],
+                             [('xml', 'http://www.w3.org/XML/1998/namespace', 2),
+                              ('tns', 'http://xpath.test/ns', 3)])
+        self.assertIs(elem.namespace_nodes, elem._namespace_nodes)
+
     def test_node_children_function(self):
         self.assertListEqual(ElementNode(self.elem).children, [])
         elem = ElementNode(ElementTree.XML("<A><B1/><B2/></A>"))
@@ -304,6 +458,29 @@ class XPathNodesTest(unittest.TestCase):
             typed_element = ElementNode(element.elem, xsd_type=xsd_type)
             self.assertEqual(typed_element.kind, 'element')
 
+    def test_nodes_have_no_instance_dict(self):
+        nodes = [
+            DocumentNode(ElementTree.parse(io.StringIO(u'<A/>'))),
+            ElementNode(ElementTree.Element('schema')),
+            AttributeNode('id', '0212349350'),
+            NamespaceNode('xs', 'http://www.w3.org/2001/XMLSchema'),
+            CommentNode(ElementTree.Comment('nothing important')),
+            ProcessingInstructionNode(
+                ElementTree.ProcessingInstruction('action', 'nothing to do')
+            ),
+            TextNode('betelgeuse'),
+        ]
+        if xmlschema is not None:
+            schema = xmlschema.XMLSchema(dedent("""
+                <xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">
+                  <xs:element name="elem"/>
+                </xs:schema>"""))
+            nodes.append(XPathSchemaContext(schema).root)
+
+        for node in nodes:
+            with self.subTest(node=node):
+                self.assertFalse(hasattr(node, '__dict__'))
+
     def test_name_property(self):
         root = self.context.root
         attr = AttributeNode('a1', '20')
@@ -322,6 +499,84 @@ class XPathNodesTest(unittest.TestCase):
             typed_attr = AttributeNode('a1', value='20', xsd_type=xsd_type)
             self.assertEqual(typed_attr.name, 'a1')
 
+    def test_prefixed_name_property(self):
+        elem = ElementTree.Element('{http://xpath.test/ns}root')
+        node = ElementNode(elem, nsmap={'tst': 'http://xpath.test/ns'})
+        self.assertEqual(node.prefixed_name, 'tst:root')
+        self.assertIs(node.prefixed_name, node.prefixed_name)
+
+        node = ElementNode(elem)
+        self.assertEqual(node.prefixed_name, '{http://xpath.test/ns}root')
+        self.assertEqual(self.context.root.prefixed_name, 'root')
+
+        node.nsmap = {'p': 'http://xpath.test/ns'}
+        self.assertEqual(node.prefixed_name, 'p:root')
+        elem.tag = '{http://xpath.test/ns}other'
+        self.assertEqual(node.prefixed_name, 'p:other')
+
+    def test_local_name_and_namespace_uri_properties(self):
+        elem = ElementTree.Element('{http://xpath.test/ns}root')
+        node = ElementNode(elem)
+        self.assertEqual(node.local_name, 'root')
+        self.assertEqual(node.namespace_uri, 'http://xpath.test/ns')
+        self.assertEqual(node.uri_qualified_name, 'Q{http://xpath.test/ns}root')
+        self.assertIs(node.uri_qualified_name, node.uri_qualified_name)
+        self.assertTrue(node.match_name('root', 'http://xpath.test/ns'))
+        self.assertFalse(node.match_name('root', 'http://xpath.test/other'))
+
+        self.assertEqual(self.context.root.local_name, 'root')
+        self.assertEqual(self.context.root.namespace_uri, '')
+        self.assertEqual(self.context.root.uri_qualified_name, 'Q{}root')
+
+        attr = AttributeNode('{http://xpath.test/ns}a1', '10')
+        self.assertEqual(attr.local_name, 'a1')
+        self.assertEqual(attr.namespace_uri, 'http://xpath.test/ns')
+        self.assertEqual(attr.uri_qualified_name, 'Q{http://xpath.test/ns}a1')
+        self.assertEqual(AttributeNode('a1', '10').uri_qualified_name, 'a1')
+
+        attr = AttributeNode(None, '10')
+        self.assertEqual(attr.local_name, '')
+        self.assertEqual(attr.namespace_uri, '')
+
+        self.assertEqual(TextNode('alpha').local_name, '')
+
+    def test_str_subclass_names(self):
+        class S(str):
+            pass
+
+        root = ElementTree.Element(S('foo'), attrib={S('a'): '1'})
+        context = XPathContext(root, namespaces={'p': S('urn:x')})
+        self.assertEqual(context.root.local_name, 'foo')
+        self.assertEqual(context.root.attributes[0].name, 'a')
+        self.assertIn('urn:x', [x.uri for x in context.root.namespace_nodes])
+        self.assertEqual(NamespaceNode(S('p'), S('urn:x')).as_item(), ('p', 'urn:x'))
+
+    def test_element_node_rename(self):
+        root = ElementTree.XML('<A><B/></A>')
+        context = XPathContext(root)
+        node = context.root[0]
+        self.assertTrue(node.match_name('B'))
+        self.assertEqual(node.uri_qualified_name, 'Q{}B')
+
+        root[0].tag = '{http://xpath.test/ns}X'
+        self.assertFalse(node.match_name('B'))
+        self.assertTrue(node.match_name('X', 'http://xpath.test/ns'))
+        self.assertTrue(node.match_name('*:X'))
+        self.assertEqual(node.local_name, 'X')
+        self.assertEqual(node.namespace_uri, 'http://xpath.test/ns')
+        self.assertEqual(node.uri_qualified_name, 'Q{http://xpath.test/ns}X')
+
+    def test_element_node_with_qname_tag(self):
+        root = ElementTree.XML('<A/>')
+        ElementTree.SubElement(root, ElementTree.QName('c'))
+        ElementTree.SubElement(root, ElementTree.QName('http://xpath.test/ns', 'd'))
+        context = XPathContext(root)
+
+        self.assertTrue(context.root[0].match_name('c'))
+        self.assertFalse(context.root[0].match_name('d'))
+        self.assertTrue(context.root[1].match_name('d', 'http://xpath.test/ns'))
+        self.assertTrue(context.root[1].match_name('{http://xpath.test/ns}d'))
+
     def test_path_property(self):
         root = ElementTree.XML('<A><B1><C1/></B1><B2/><B3><C1/><C2 max="10"/></B3></A>')
 
@@ -342,6 +597,26 @@ class XPathNodesTest(unittest.TestCase):
         context = XPathContext(root=document)
         self.assertEqual(context.root[0][2][0].path, '/A/B3/C1')
 
+        root = ElementTree.XML('<A/>')
+        elem = root
+        for _ in range(2000):
+            elem = ElementTree.SubElement(elem, 'B')
+        context = XPathContext(root)
+        node = context.root
+        while node.children:
+            node = node.children[0]
+        self.assertEqual(node.path, '/A' + '/B' * 2000)
+
+        root_node = get_node_tree(ElementTree.XML('<A><B><C/></B></A>'))
+        self.assertEqual(root_node[0].path, '/A/B')
+        self.assertEqual(root_node[0][0].path, '/A/B/C')
+        document_node = DocumentNode.from_element_node(root_node)
+        self.assertEqual(document_node[0].path, '/B')
+        self.assertEqual(document_node[0][0].path, '/B/C')
+
+        document_node[0].elem.tag = 'X'
+        self.assertEqual(document_node[0][0].path, '/X/C')
+
         root = ElementTree.XML('<A><B1>10</B1><B2 min="1"/><B3/></A>')
         context = XPathContext(root)
         with patch.object(DummyXsdType(), 'is_simple', return_value=True) as xsd_type:
@@ -355,6 +630,23 @@ class XPathNodesTest(unittest.TestCase):
             attr.xsd_type = xsd_type
             self.assertEqual(attr.path, '/A/B2/@min')
 
+    def test_get_child_position(self):
+        root = ElementTree.XML('<A>text1<B/><C/>text2<B/><C/><B/></A>')
+        context = XPathContext(root)
+
+        positions = [context.root.get_child_position(child) for child in context.root]
+        self.assertListEqual(positions, [1, 1, 1, 2, 2, 2, 3])
+        self.assertIsNotNone(context.root._child_positions)
+
+        with self.assertRaises(KeyError):
+            context.root.get_child_position(context.root)
+
+        # Children appended after the first call are found rebuilding the map
+        child = ElementNode(ElementTree.Element('B'), context.root)
+        context.root.children.append(child)
+        self.assertEqual(context.root.get_child_position(child), 4)
+        self.assertEqual(context.root.get_child_position(context.root[1]), 1)
+
     def test_element_node_iter(self):
         root = ElementTree.XML('<A>text1\n<B1 a="10">text2</B1><B2/><B3><C1>text3</C1></B3></A>')
 
@@ -382,6 +674,30 @@ class XPathNodesTest(unittest.TestCase):
             list(root.iter())
         )
 
+    def test_lazy_element_node_iter_descendants(self):
+        root = ElementTree.XML('<A>text1<B1>text2</B1>tail1<B2/><B3><C1>text3</C1></B3></A>')
+        root_node = LazyElementNode(root)
+
+        result = [
+            node.elem if isinstance(node, ElementNode) else node.value
+            for node in root_node.iter_descendants()
+        ]
+        self.assertListEqual(result, [
+            root, 'text1', root[0], 'text2', 'tail1', root[1], root[2], root[2][0], 'text3'
+        ])
+
+        children = list(root_node)
+        self.assertEqual(len(children), 5)
+        self.assertListEqual(list(root_node), children)  # children are built once
+
+        root = elem = ElementTree.Element('A')
+        for _ in range(2000):
+            elem = ElementTree.SubElement(elem, 'B')
+
+        nodes = list(LazyElementNode(root).iter_descendants(with_self=False))
+        self.assertEqual(len(nodes), 2000)
+        self.assertIs(nodes[-1].elem, elem)
+
     def test_document_node_iter(self):
         root = ElementTree.XML('<A><B1><C1/></B1><B2/><B3><C1/><C2/></B3></A>')
         doc = ElementTree.ElementTree(root)
@@ -392,6 +708,18 @@ class XPathNodesTest(unittest.TestCase):
             list(doc.iter())
         )
 
+    @unittest.skipIf(lxml_etree is None, 'lxml library is not installed')
+    def test_document_node_is_extended(self):
+        document = lxml_etree.XML('<!--comment--><A/><?pi content?>').getroottree()
+        document_node = get_node_tree(document)
+        self.assertEqual(len(document_node.children), 3)
+        self.assertFalse(document_node.is_extended())
+
+        root_node = get_node_tree(lxml_etree.XML('<A/>'))
+        root_node.children.append(TextNode('text', root_node))
+        root_node.children.append(ElementNode(lxml_etree.Element('B'), root_node))
+        self.assertTrue(DocumentNode.from_element_node(root_node).is_extended())
+
     def test_is_schema_node(self):
         root = ElementTree.XML('<root a="10">text</root>')
         context = XPathContext(root)
@@ -137,6 +137,12 @@ class XPath1TokenTest(unittest.TestCase):
         self.assertEqual(token.tree, '(/ (/ (A)) ([ (B) (C)))')
         self.assertListEqual(list(token.iter_leaf_elements()), ['B'])
 
+        token = self.parser.parse('A/B | C/D | E')
+        self.assertListEqual(list(token.iter_leaf_elements()), ['B', 'D', 'E'])
+
+        token = self.parser.parse('/'.join(f'A{k}' for k in range(500)))
+        self.assertListEqual(list(token.iter_leaf_elements()), ['A499'])
+
     def test_get_argument_method(self):
         token = self.parser.symbol_table['true'](self.parser)
 
@@ -144,6 +150,14 @@ class XPath1TokenTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             token.get_argument(1, required=True)
 
+        root = ElementTree.XML('<A><B>10</B></A>')
+        context = XPathContext(root, variables={'v': 'foo'})
+        item = context.item
+        for expr in ('string(B)', 'string("bar")', 'string($v)'):
+            token = self.parser.parse(expr)
+            self.assertIn(token.get_argument(context), (context.root[0], 'bar', 'foo'))
+            self.assertIs(context.item, item)
+
     @patch.multiple(DummyXsdType,
                     is_simple=lambda x: False,
                     has_simple_content=lambda x: True)